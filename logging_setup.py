@@ -0,0 +1,15 @@
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - [%(funcName)s] - %(message)s'
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    Configure logging for the application.
+
+    Call this once from an entry point; library modules only log.
+
+    Args:
+        level (int): The root logging level.
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
@@ -1,30 +1,26 @@
 import logging
 import asyncio
-from typing import List, Dict
+import aiohttp
+from typing import List
 from podcast_collector import collect_transcripts
 from payload_builder import build_payload
 from notifier import send_payload
+from logging_setup import setup_logging
+from transcript_models import TranscriptPayload
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(funcName)s] - %(message)s'
-)
-
-def display_transcript_summary(results: List[Dict]) -> None:
+def display_transcript_summary(results: List[TranscriptPayload]) -> None:
     """
     Display a summary of the collected transcripts.
     
     Args:
-        results (List[Dict]): List of transcript results with metadata
+        results (List[TranscriptPayload]): List of transcript results with metadata
     """
     logging.info("\n=== Transcript Collection Summary ===")
     for i, result in enumerate(results, 1):
-        metadata = result['metadata']
-        logging.info(f"\nTranscript {i}:")
-        logging.info(f"Title: {metadata.get('title', 'Unknown')}")
-        logging.info(f"Duration: {metadata.get('duration', 0):.2f} seconds")
-        logging.info(f"Word Count: {metadata.get('words', 0)}")
+        logging.info("\nTranscript %d:", i)
+        logging.info("Title: %s", result.title or 'Unknown')
+        logging.info("Duration: %.2f seconds", result.duration or 0)
+        logging.info("Word Count: %s", result.words)
 
 async def main() -> None:
     """
@@ -40,7 +36,7 @@ async def main() -> None:
         ]
         
         # Collect transcripts
-        logging.info(f"Starting transcript collection for {len(feeds)} feeds...")
+        logging.info("Starting transcript collection for %d feeds...", len(feeds))
         results = await collect_transcripts(feeds)
         
         if not results:
@@ -50,22 +46,20 @@ async def main() -> None:
         # Display summary of collected transcripts
         display_transcript_summary(results)
         
-        # Extract just the transcripts for the payload
-        transcripts = [result['transcript'] for result in results]
-        
         # Build payload
         logging.info("Building payload...")
-        payload = build_payload(transcripts)
+        payload = build_payload(results)
         
         # Send to NotebookLLM (replace with actual endpoint)
         endpoint = "https://api.notebookllm.com/process"  # Replace with actual endpoint
-        logging.info(f"Sending payload to {endpoint}...")
-        send_payload(endpoint, payload)
+        logging.info("Sending payload to %s...", endpoint)
+        async with aiohttp.ClientSession() as session:
+            await send_payload(endpoint, payload, session)
         
         logging.info("Process completed successfully!")
         
     except Exception as e:
-        logging.error(f"An error occurred in main: {str(e)}")
+        logging.error("An error occurred in main: %s", e)
         raise
 
 def run_main():
@@ -73,6 +67,12 @@ def run_main():
     Entry point for the Poetry script.
     Handles running the async main function.
     """
+    setup_logging()
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
 
 if __name__ == '__main__':
@@ -1,18 +1,33 @@
 import logging
-import requests
-from typing import Dict, Any
+import aiohttp
+import orjson
+from typing import Dict, Any, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-def send_payload(endpoint: str, payload: Dict[str, Any]) -> None:
+async def send_payload(
+    endpoint: str,
+    payload: Dict[str, Any],
+    session: Optional[aiohttp.ClientSession] = None
+) -> None:
     """
     Sends the payload to the specified endpoint.
 
     Args:
         endpoint (str): The URL of the endpoint to send the payload to.
         payload (Dict[str, Any]): The payload to send.
+        session (Optional[aiohttp.ClientSession]): Session to send the payload
+            with, so its connection pool is reused. A temporary session is
+            opened when none is given.
     """
-    logging.info(f'Sending payload to {endpoint}')
-    response = requests.post(endpoint, json=payload)
-    logging.info(f'Response status: {response.status_code}, Response: {response.json()}')
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await send_payload(endpoint, payload, session)
+
+    logging.info('Sending payload to %s', endpoint)
+    async with session.post(
+        endpoint,
+        data=orjson.dumps(payload),
+        headers={'Content-Type': 'application/json'},
+        timeout=aiohttp.ClientTimeout(total=30)
+    ) as response:
+        body = orjson.loads(await response.read())
+        logging.info('Response status: %s, Response: %s', response.status, body)
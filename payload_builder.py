@@ -1,14 +1,16 @@
 from typing import List, Dict
+from transcript_models import TranscriptPayload
 
 
-def build_payload(transcripts: List[str]) -> Dict[str, List[str]]:
+def build_payload(results: List[TranscriptPayload]) -> Dict[str, List[str]]:
     """
-    Builds a payload from the collected transcripts.
+    Builds a payload from the collected transcript results.
 
     Args:
-        transcripts (List[str]): A list of transcripts.
+        results (List[TranscriptPayload]): Transcript results, as returned
+            by collect_transcripts.
 
     Returns:
         Dict[str, List[str]]: A dictionary containing the transcripts.
     """
-    return {'transcripts': transcripts}
+    return {'transcripts': [result.transcript for result in results]}
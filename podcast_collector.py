@@ -1,107 +1,369 @@
 import asyncio
+import json
 import logging
-from typing import Dict, List, Optional
+import sqlite3
+import time
+from typing import Dict, List, Optional, Set
 import feedparser
-from deepgram import Deepgram
+from deepgram import DeepgramClient, PrerecordedOptions
 import aiohttp
+import httpx
+from aiolimiter import AsyncLimiter
 import os
-from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
-from weaviate_config import init_weaviate_client, ensure_schema_exists, store_podcast_transcript
+from logging_setup import setup_logging
+from transcript_models import TranscriptPayload
+from weaviate_config import get_weaviate_client, ensure_schema_exists, store_podcast_transcripts_bulk
 
 # Load environment variables
 load_dotenv()
 
-async def transcribe_audio(audio_url: str, dg_client: Deepgram) -> Optional[Dict]:
+DEEPGRAM_API_KEY = os.getenv('DEEPGRAM_API_KEY')
+
+# Shared Deepgram client, reused across all transcriptions
+_DG = DeepgramClient(DEEPGRAM_API_KEY) if DEEPGRAM_API_KEY else None
+
+# Speaker labels and paragraphs make Deepgram's response much larger, so only
+# request them when asked for
+DEEPGRAM_WANT_SPEAKERS = os.getenv('DEEPGRAM_WANT_SPEAKERS') == '1'
+
+# Prerecorded transcription answers only once the whole episode is done, which
+# for multi-hour episodes takes far longer than the SDK's 30s default
+DEEPGRAM_TIMEOUT = httpx.Timeout(float(os.getenv('DEEPGRAM_TIMEOUT', '300')), connect=10.0)
+
+# Per-upstream request rates (requests per second), to stay under provider throttling
+deepgram_limiter = AsyncLimiter(max_rate=int(os.getenv('DEEPGRAM_RATE_LIMIT', '10')), time_period=1)
+weaviate_limiter = AsyncLimiter(max_rate=int(os.getenv('WEAVIATE_RATE_LIMIT', '10')), time_period=1)
+
+# Per-feed ETag/Last-Modified values, used to skip unchanged feeds
+FEED_CACHE_PATH = Path(os.getenv('HODGEPOD_FEED_CACHE', Path.home() / '.hodgepod' / 'feed_cache.json'))
+
+def load_feed_cache() -> Dict[str, Dict]:
+    """
+    Load the feed cache, returning an empty cache if it is missing or unreadable.
+    """
+    try:
+        with open(FEED_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_feed_cache(feed_cache: Dict[str, Dict]) -> None:
+    """
+    Persist the feed cache.
+    """
+    try:
+        FEED_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(FEED_CACHE_PATH, 'w') as f:
+            json.dump(feed_cache, f)
+    except OSError as e:
+        logging.error("Error saving feed cache: %s", e)
+
+# Episode URLs that have already been transcribed and stored
+EPISODE_DB_PATH = Path(os.getenv('HODGEPOD_EPISODE_DB', Path.home() / '.hodgepod' / 'processed.sqlite'))
+
+def open_episode_db() -> sqlite3.Connection:
+    """
+    Open the processed-episode database, creating it if needed.
+    """
+    EPISODE_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(EPISODE_DB_PATH)
+    conn.execute('CREATE TABLE IF NOT EXISTS seen(url TEXT PRIMARY KEY)')
+    return conn
+
+def mark_episodes_processed(conn: sqlite3.Connection, episode_urls: List[str]) -> None:
+    """
+    Record episode URLs as processed so later runs skip them.
+    """
+    conn.executemany('INSERT OR IGNORE INTO seen(url) VALUES (?)', [(url,) for url in episode_urls])
+    conn.commit()
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create the pooled HTTP session shared by all feed requests in a run.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=32,
+        limit_per_host=8,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+def _check_audio_response(response: aiohttp.ClientResponse, audio_url: str) -> Optional[str]:
+    """
+    Return the final URL of an audio response, or None if it is not usable audio.
+    """
+    content_type = response.headers.get('Content-Type', '')
+    if response.status not in (200, 206):
+        logging.warning("Skipping episode, HTTP %s: %s", response.status, audio_url)
+        return None
+    if 'audio' not in content_type and 'octet-stream' not in content_type:
+        logging.warning("Skipping episode, not audio (%s): %s", content_type, audio_url)
+        return None
+    if response.headers.get('Content-Length') == '0':
+        logging.warning("Skipping episode, empty file: %s", audio_url)
+        return None
+    return str(response.url)
+
+async def resolve_audio_url(audio_url: str, session: aiohttp.ClientSession) -> Optional[str]:
+    """
+    Check an episode URL with a HEAD request before sending it to Deepgram.
+
+    Hosts that refuse HEAD with 403 or 405, such as GET-only presigned
+    object-store URLs, are checked with a one-byte ranged GET instead.
+    Redirects are followed, so the returned URL points straight at the
+    audio. Returns None for errors, empty files and non-audio responses.
+    """
+    try:
+        async with session.head(audio_url, allow_redirects=True) as response:
+            if response.status not in (403, 405):
+                return _check_audio_response(response, audio_url)
+
+        async with session.get(audio_url, headers={'Range': 'bytes=0-0'}, allow_redirects=True) as response:
+            return _check_audio_response(response, audio_url)
+
+    except aiohttp.ClientError as e:
+        logging.error("Error checking audio URL: %s", e)
+        return None
+
+async def transcribe_audio(audio_url: str, want_speakers: bool = DEEPGRAM_WANT_SPEAKERS) -> Optional[Dict]:
     """
     Transcribe audio from URL using Deepgram.
+
+    Diarization and paragraphs are only requested when ``want_speakers`` is
+    set; the plain transcript is always read from the first alternative.
     """
     try:
         source = {'url': audio_url}
-        response = await dg_client.listen.prerecorded.v("1").transcribe_url(source)
+        if want_speakers:
+            options = PrerecordedOptions(smart_format=True, punctuate=True, diarize=True, paragraphs=True)
+        else:
+            options = PrerecordedOptions(smart_format=True, punctuate=True)
+        async with deepgram_limiter:
+            response = await _DG.listen.asyncrest.v("1").transcribe_url(
+                source, options, timeout=DEEPGRAM_TIMEOUT
+            )
         
-        if response and 'results' in response:
+        if response and response.results:
+            alternative = response.results.channels[0].alternatives[0]
+            # Deepgram already returns the recognized words, so count those
+            # rather than splitting the whole transcript
             return {
-                'transcript': response['results']['channels'][0]['alternatives'][0]['transcript'],
-                'words': len(response['results']['channels'][0]['alternatives'][0]['transcript'].split())
+                'transcript': alternative.transcript,
+                'words': len(alternative.words or [])
             }
         return None
         
     except Exception as e:
-        logging.error(f"Error transcribing audio: {str(e)}")
+        logging.error("Error transcribing audio: %s", e)
         return None
 
-async def process_feed(feed_url: str, dg_client: Deepgram) -> List[Dict]:
+async def process_feed(
+    feed_url: str,
+    session: aiohttp.ClientSession,
+    episodes_per_feed: int = 1,
+    feed_cache: Optional[Dict[str, Dict]] = None,
+    seen: Optional[Set[str]] = None,
+    queue: Optional[asyncio.Queue] = None,
+    feed_versions: Optional[Dict[str, Dict]] = None
+) -> List[TranscriptPayload]:
     """
     Process a podcast RSS feed and transcribe episodes.
+
+    The latest ``episodes_per_feed`` episodes are transcribed concurrently.
+    When a ``feed_cache`` is given, the feed is fetched conditionally and
+    skipped if the server reports it unchanged. Episodes whose audio URL is
+    in ``seen`` have already been stored and are not transcribed again.
+    If a ``queue`` is given, each transcript is put on it as soon as it is
+    ready. Once every selected episode is transcribed, the feed's new
+    ETag/Last-Modified are recorded in ``feed_versions``; the caller moves
+    them into the cache only after the transcripts have been stored.
     """
     try:
-        feed = feedparser.parse(feed_url)
-        transcripts = []
+        cached = feed_cache.get(feed_url, {}) if feed_cache is not None else {}
+
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('modified'):
+            headers['If-Modified-Since'] = cached['modified']
+
+        async with session.get(feed_url, headers=headers) as response:
+            if response.status == 304:
+                logging.info("Feed unchanged, skipping: %s", feed_url)
+                return []
+            response.raise_for_status()
+            body = await response.read()
+            etag = response.headers.get('ETag')
+            modified = response.headers.get('Last-Modified')
+
+        # Parsing large feeds is CPU-bound, so keep it off the event loop
+        feed = await asyncio.to_thread(feedparser.parse, body)
+
+        episodes = []
         
-        for entry in feed.entries[:1]:  # Process only the latest episode for testing
-            audio_url = None
-            duration = None
-            
+        for entry in feed.entries[:episodes_per_feed]:
             # Find the audio URL and duration
             for link in entry.links:
                 if link.type and 'audio' in link.type:
-                    audio_url = link.href
+                    if seen is not None and link.href in seen:
+                        break
                     duration = float(getattr(entry, 'itunes_duration', 0))
+                    episodes.append((entry, link.href, duration))
                     break
-            
-            if audio_url:
-                transcript_data = await transcribe_audio(audio_url, dg_client)
-                
-                if transcript_data:
-                    transcript_data['metadata'] = {
-                        'title': entry.title,
-                        'duration': duration,
-                        'episode_url': audio_url,
-                        'feed_url': feed_url,
-                        'published_date': datetime(*entry.published_parsed[:6]).isoformat(),
-                        'words': transcript_data['words']
-                    }
-                    transcripts.append(transcript_data)
+        
+        async def transcribe_episode(entry, audio_url: str, duration: float) -> Optional[TranscriptPayload]:
+            resolved_url = await resolve_audio_url(audio_url, session)
+            if not resolved_url:
+                return None
+            transcript_data = await transcribe_audio(resolved_url)
+            if not transcript_data:
+                return None
+            payload = TranscriptPayload(
+                transcript=transcript_data['transcript'],
+                title=entry.title,
+                duration=duration,
+                words=transcript_data['words'],
+                episode_url=audio_url,
+                feed_url=feed_url,
+                # feedparser normalizes published_parsed to UTC; Weaviate DATE needs the offset
+                published_date=time.strftime('%Y-%m-%dT%H:%M:%SZ', entry.published_parsed)
+                    if entry.get('published_parsed') else None
+            )
+            if queue is not None:
+                await queue.put(payload)
+            return payload
+
+        results = await asyncio.gather(*(transcribe_episode(*episode) for episode in episodes))
+        transcripts = [payload for payload in results if payload]
+
+        # Only offer the feed version once all of its episodes went through
+        if feed_versions is not None and len(transcripts) == len(episodes):
+            feed_versions[feed_url] = {'etag': etag, 'modified': modified}
                     
         return transcripts
         
     except Exception as e:
-        logging.error(f"Error processing feed: {str(e)}")
+        logging.error("Error processing feed: %s", e)
         return []
 
-async def collect_transcripts(feed_urls: List[str]) -> None:
+async def store_transcripts(
+    queue: asyncio.Queue,
+    weaviate_client,
+    episode_db: sqlite3.Connection,
+    seen: Set[str],
+    batch_size: int = 8
+) -> List[TranscriptPayload]:
+    """
+    Drain transcripts from the queue into Weaviate in batches.
+
+    Runs until a ``None`` sentinel is received and returns every transcript
+    it consumed. A failed flush is logged and the storer keeps draining, so
+    producers never block on a full queue.
+    """
+    results = []
+    batch = []
+
+    async def flush() -> None:
+        try:
+            # The Weaviate client is synchronous, so keep the batch off the event loop
+            async with weaviate_limiter:
+                uuids = await asyncio.to_thread(store_podcast_transcripts_bulk, weaviate_client, batch)
+            stored = [
+                transcript.episode_url
+                for transcript, uuid in zip(batch, uuids) if uuid
+            ]
+            mark_episodes_processed(episode_db, stored)
+            seen.update(stored)
+            logging.info("Stored %d/%d transcripts", len(stored), len(batch))
+        except Exception as e:
+            logging.error("Error storing transcripts: %s", e)
+        finally:
+            results.extend(batch)
+            batch.clear()
+
+    while True:
+        transcript = await queue.get()
+        if transcript is None:
+            break
+        batch.append(transcript)
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+    return results
+
+async def collect_transcripts(feed_urls: List[str], episodes_per_feed: int = 1) -> List[TranscriptPayload]:
     """
     Collect and store transcripts from multiple podcast feeds.
+
+    Feeds are processed concurrently, bounded by the FEED_CONCURRENCY
+    environment variable (default 8) to stay under Deepgram's rate limits.
+    Finished transcripts are streamed through a bounded queue to a single
+    storer task, so Weaviate writes overlap with ongoing transcription.
     """
+    all_results = []
+    feed_cache = load_feed_cache()
+    episode_db = open_episode_db()
+    seen = {row[0] for row in episode_db.execute('SELECT url FROM seen')}
+    session = create_http_session()
+    storer = None
+    feed_versions = {}
     try:
+        if _DG is None:
+            raise RuntimeError("DEEPGRAM_API_KEY is not set")
+
         # Initialize clients
-        dg_client = Deepgram(os.getenv('DEEPGRAM_API_KEY'))
-        weaviate_client = init_weaviate_client()
+        weaviate_client = get_weaviate_client()
         
         # Ensure Weaviate schema exists
         ensure_schema_exists(weaviate_client)
         
-        # Process each feed
-        for feed_url in feed_urls:
-            transcripts = await process_feed(feed_url, dg_client)
-            
-            # Store transcripts in Weaviate
-            for transcript in transcripts:
-                uuid = store_podcast_transcript(weaviate_client, transcript)
-                if uuid:
-                    logging.info(f"Stored transcript with UUID: {uuid}")
-                else:
-                    logging.error("Failed to store transcript")
+        semaphore = asyncio.Semaphore(int(os.getenv('FEED_CONCURRENCY', '8')))
+        queue = asyncio.Queue(maxsize=16)
+        storer = asyncio.create_task(store_transcripts(queue, weaviate_client, episode_db, seen))
+
+        async def process_feed_bounded(feed_url: str) -> List[TranscriptPayload]:
+            async with semaphore:
+                return await process_feed(
+                    feed_url, session, episodes_per_feed, feed_cache, seen, queue, feed_versions
+                )
+
+        # Process all feeds concurrently
+        feed_results = await asyncio.gather(
+            *(process_feed_bounded(feed_url) for feed_url in feed_urls),
+            return_exceptions=True
+        )
+        
+        # Signal the storer that no more transcripts are coming
+        await queue.put(None)
+        all_results = await storer
+
+        for feed_url, transcripts in zip(feed_urls, feed_results):
+            if isinstance(transcripts, BaseException):
+                logging.error("Error processing feed %s: %s", feed_url, transcripts)
+                continue
+            # Cache the feed version only if every episode actually reached Weaviate,
+            # otherwise a 304 next run would hide the unstored episodes
+            if feed_url in feed_versions and all(t.episode_url in seen for t in transcripts):
+                feed_cache[feed_url] = feed_versions[feed_url]
                     
     except Exception as e:
-        logging.error(f"Error in collect_transcripts: {str(e)}")
+        logging.error("Error in collect_transcripts: %s", e)
     finally:
-        await dg_client.close()
+        if storer is not None and not storer.done():
+            storer.cancel()
+        save_feed_cache(feed_cache)
+        episode_db.close()
+        await session.close()
+
+    return all_results
 
 if __name__ == "__main__":
-    # Configure logging
-    logging.basicConfig(level=logging.INFO)
+    setup_logging()
     
     # Example feed URLs
     feed_urls = [
@@ -109,5 +371,10 @@ if __name__ == "__main__":
         "https://lexfridman.com/feed/podcast/"
     ]
     
-    # Run the collector
+    # Run the collector, on uvloop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(collect_transcripts(feed_urls))
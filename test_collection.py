@@ -1,15 +1,20 @@
 import asyncio
+import itertools
+import json
 import logging
+import re
+import sqlite3
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from aiolimiter import AsyncLimiter
+from deepgram import PrerecordedResponse
+import podcast_collector
 from podcast_collector import collect_transcripts
-from weaviate_config import init_weaviate_client, ensure_schema_exists, CLASS_OBJ_PODCASTS
+from weaviate_config import init_weaviate_client, ensure_schema_exists, store_podcast_transcripts_bulk
 import weaviate
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(funcName)s] - %(message)s'
-)
+from logging_setup import setup_logging
 
 async def test_single_feed(feed_url: str) -> None:
     """
@@ -18,7 +23,7 @@ async def test_single_feed(feed_url: str) -> None:
     Args:
         feed_url (str): URL of the podcast RSS feed to test
     """
-    logging.info(f"\n=== Testing Transcript Collection for Feed ===\n{feed_url}")
+    logging.info("\n=== Testing Transcript Collection for Feed ===\n%s", feed_url)
     
     try:
         results = await collect_transcripts([feed_url])
@@ -29,22 +34,212 @@ async def test_single_feed(feed_url: str) -> None:
             
         # Display detailed results
         for result in results:
-            metadata = result['metadata']
             logging.info("\n=== Transcript Details ===")
-            logging.info(f"Title: {metadata['title']}")
-            logging.info(f"Duration: {metadata['duration']:.2f} seconds")
-            logging.info(f"Word Count: {metadata['words']}")
+            logging.info("Title: %s", result.title)
+            logging.info("Duration: %.2f seconds", result.duration)
+            logging.info("Word Count: %s", result.words)
             
-            # Show first 100 words of transcript
-            words = result['transcript'].split()[:100]
-            preview = ' '.join(words)
+            # Show first 100 words of transcript, without splitting all of it
+            words = itertools.islice(re.finditer(r'\S+', result.transcript), 100)
+            preview = ' '.join(match.group(0) for match in words)
             logging.info("\n=== Transcript Preview (first 100 words) ===")
             logging.info(preview)
             
     except Exception as e:
-        logging.error(f"Error during testing: {str(e)}")
+        logging.error("Error during testing: %s", e)
         raise
 
+class TestTranscribeAudio(unittest.TestCase):
+    def test_reads_prerecorded_response(self):
+        """Test that a Deepgram PrerecordedResponse is turned into a transcript"""
+        response = PrerecordedResponse.from_dict({
+            "results": {
+                "channels": [{
+                    "alternatives": [{
+                        "transcript": "hello world",
+                        "confidence": 0.99,
+                        "words": [
+                            {"word": "hello", "start": 0.0, "end": 0.5, "confidence": 0.99},
+                            {"word": "world", "start": 0.5, "end": 1.0, "confidence": 0.99},
+                        ],
+                    }],
+                }],
+            },
+        })
+
+        with patch.object(podcast_collector, '_DG') as dg_client:
+            transcribe_url = AsyncMock(return_value=response)
+            dg_client.listen.asyncrest.v.return_value.transcribe_url = transcribe_url
+            result = asyncio.run(podcast_collector.transcribe_audio('https://example.com/episode.mp3'))
+
+        self.assertEqual(result, {'transcript': 'hello world', 'words': 2})
+        # Long episodes need more than the SDK's 30s default
+        self.assertIs(transcribe_url.await_args.kwargs['timeout'], podcast_collector.DEEPGRAM_TIMEOUT)
+
+FEED_URL = 'https://example.com/feed.xml'
+FEED_ETAG = '"v1"'
+
+def _feed_body(episodes: int) -> bytes:
+    """Build an RSS feed with one audio enclosure per episode"""
+    items = ''.join(
+        f'<item><title>Episode {i}</title>'
+        f'<enclosure url="https://example.com/{i}.mp3" type="audio/mpeg" length="1"/></item>'
+        for i in range(episodes)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Test</title>{items}</channel></rss>'.encode()
+
+class _FakeResponse:
+    def __init__(self, status: int, body: bytes = b'', headers=None, url: str = ''):
+        self.status = status
+        self.headers = headers or {}
+        self.url = url
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def read(self):
+        return self._body
+
+class _FakeSession:
+    """Serve one feed, answering 304 once the client sends its ETag back"""
+    def __init__(self, body: bytes):
+        self.body = body
+        self.requests = []
+
+    def get(self, url, headers=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        if headers.get('If-None-Match') == FEED_ETAG:
+            return _FakeResponse(304)
+        return _FakeResponse(200, self.body, {'ETag': FEED_ETAG})
+
+    async def close(self):
+        pass
+
+def _store_all(client, transcripts):
+    return [f'uuid-{i}' for i in range(len(transcripts))]
+
+def _store_none(client, transcripts):
+    return [None] * len(transcripts)
+
+def _store_raises(client, transcripts):
+    raise RuntimeError("Weaviate unavailable")
+
+class TestCollectTranscripts(unittest.TestCase):
+    def setUp(self):
+        self._reset()
+
+    def _reset(self):
+        """Start from an empty feed cache and episode database"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_path = Path(tmp.name) / 'feed_cache.json'
+        self.db_path = Path(tmp.name) / 'processed.sqlite'
+        self.transcribe = AsyncMock(return_value={'transcript': 'hello world', 'words': 2})
+
+    def _collect(self, session, store, episodes_per_feed=1):
+        """Run collect_transcripts against the fake feed, with Deepgram and Weaviate mocked out"""
+        with patch.multiple(
+            podcast_collector,
+            _DG=MagicMock(),
+            FEED_CACHE_PATH=self.cache_path,
+            EPISODE_DB_PATH=self.db_path,
+            weaviate_limiter=AsyncLimiter(100, 1),
+            get_weaviate_client=MagicMock(),
+            ensure_schema_exists=MagicMock(),
+            create_http_session=MagicMock(return_value=session),
+            resolve_audio_url=AsyncMock(side_effect=lambda url, session: url),
+            transcribe_audio=self.transcribe,
+            store_podcast_transcripts_bulk=store
+        ):
+            # A deadlocked storer shows up as a timeout rather than a hung run
+            return asyncio.run(asyncio.wait_for(
+                collect_transcripts([FEED_URL], episodes_per_feed), timeout=10
+            ))
+
+    def _seen(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return {row[0] for row in conn.execute('SELECT url FROM seen')}
+
+    def _feed_cache(self):
+        return json.loads(self.cache_path.read_text())
+
+    def test_failed_flush_is_not_recorded(self):
+        """Test that unstored episodes are neither marked seen nor cached by ETag"""
+        for store in (_store_none, _store_raises):
+            with self.subTest(store=store.__name__):
+                self._reset()
+                results = self._collect(_FakeSession(_feed_body(1)), store)
+
+                self.assertEqual(len(results), 1)
+                self.assertEqual(self._seen(), set())
+                self.assertNotIn(FEED_URL, self._feed_cache())
+
+    def test_sentinel_drains_full_queue(self):
+        """Test that more transcripts than the queue holds are all drained"""
+        episodes = 40
+        for store in (_store_all, _store_raises):
+            with self.subTest(store=store.__name__):
+                self._reset()
+                results = self._collect(_FakeSession(_feed_body(episodes)), store, episodes)
+
+                self.assertEqual(len(results), episodes)
+                if store is _store_all:
+                    self.assertEqual(len(self._seen()), episodes)
+
+    def test_stored_feed_is_skipped_when_unchanged(self):
+        """Test that a fully stored feed caches its ETag and returns early on 304"""
+        session = _FakeSession(_feed_body(1))
+        results = self._collect(session, _store_all)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(self._feed_cache()[FEED_URL]['etag'], FEED_ETAG)
+
+        results = self._collect(session, _store_all)
+
+        self.assertEqual(results, [])
+        self.assertEqual(session.requests[-1].get('If-None-Match'), FEED_ETAG)
+        self.transcribe.assert_awaited_once()
+
+class TestResolveAudioUrl(unittest.TestCase):
+    def test_falls_back_to_ranged_get(self):
+        """Test that a host refusing HEAD is checked with a one-byte GET"""
+        audio_url = 'https://example.com/episode.mp3'
+        for status in (403, 405):
+            with self.subTest(status=status):
+                session = MagicMock()
+                session.head.return_value = _FakeResponse(status)
+                session.get.return_value = _FakeResponse(
+                    206, headers={'Content-Type': 'audio/mpeg', 'Content-Length': '1'}, url=audio_url
+                )
+
+                result = asyncio.run(podcast_collector.resolve_audio_url(audio_url, session))
+
+                self.assertEqual(result, audio_url)
+                self.assertEqual(session.get.call_args.kwargs['headers'], {'Range': 'bytes=0-0'})
+
+class TestStoreTranscriptsBulk(unittest.TestCase):
+    def test_rejects_mismatched_vectors(self):
+        """Test that a short vectors list is rejected before any object is batched"""
+        client = MagicMock()
+        transcripts = [
+            {'transcript': 'hello world', 'title': f'Episode {i}', 'duration': 1.0,
+             'words': 2, 'episode_url': f'https://example.com/{i}.mp3', 'feed_url': FEED_URL}
+            for i in range(2)
+        ]
+
+        with self.assertRaises(ValueError):
+            store_podcast_transcripts_bulk(client, transcripts, vectors=[[0.1, 0.2]])
+        client.batch.fixed_size.assert_not_called()
+
 class TestWeaviateConnection(unittest.TestCase):
     def setUp(self):
         self.client = init_weaviate_client()
@@ -63,7 +258,7 @@ class TestSchemaSetup(unittest.TestCase):
         
         # Verify PodcastTranscript class exists
         self.assertTrue(
-            self.client.schema.exists("PodcastTranscript"),
+            self.client.collections.exists("PodcastTranscript"),
             "PodcastTranscript class should exist after schema creation"
         )
         
@@ -72,10 +267,10 @@ class TestSchemaSetup(unittest.TestCase):
         ensure_schema_exists(self.client)
         
         # Get schema for PodcastTranscript
-        schema = self.client.schema.get("PodcastTranscript")
+        config = self.client.collections.get("PodcastTranscript").config.get()
         
         # Check required properties exist
-        properties = {prop["name"] for prop in schema["properties"]}
+        properties = {prop.name for prop in config.properties}
         required_props = {"transcript", "title", "duration", "podcastName"}
         
         for prop in required_props:
@@ -88,6 +283,12 @@ class TestSchemaSetup(unittest.TestCase):
 async def main():
     # First test Weaviate setup
     suite = unittest.TestSuite()
+    suite.addTest(TestTranscribeAudio('test_reads_prerecorded_response'))
+    suite.addTest(TestCollectTranscripts('test_failed_flush_is_not_recorded'))
+    suite.addTest(TestCollectTranscripts('test_sentinel_drains_full_queue'))
+    suite.addTest(TestCollectTranscripts('test_stored_feed_is_skipped_when_unchanged'))
+    suite.addTest(TestResolveAudioUrl('test_falls_back_to_ranged_get'))
+    suite.addTest(TestStoreTranscriptsBulk('test_rejects_mismatched_vectors'))
     suite.addTest(TestWeaviateConnection('test_weaviate_connection'))
     suite.addTest(TestSchemaSetup('test_schema_creation'))
     suite.addTest(TestSchemaSetup('test_schema_properties'))
@@ -108,4 +309,5 @@ async def main():
         logging.info("\n==================================================\n")
 
 if __name__ == '__main__':
+    setup_logging()
     asyncio.run(main())
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+import msgspec
+
+
+@dataclass(slots=True)
+class TranscriptPayload:
+    """
+    A transcribed episode and its metadata, as passed between pipeline stages.
+    """
+    transcript: str
+    title: str
+    duration: float
+    words: int
+    episode_url: str
+    feed_url: str
+    podcast_name: Optional[str] = None
+    published_date: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, transcript_data: Dict[str, Any]) -> 'TranscriptPayload':
+        """
+        Build a payload from the legacy ``{'transcript', 'metadata'}`` dict.
+
+        The dict is validated against the Transcript schema first, so a
+        missing or mistyped field raises msgspec.ValidationError naming it.
+
+        Args:
+            transcript_data (Dict[str, Any]): Dictionary containing transcript and metadata
+
+        Returns:
+            TranscriptPayload: The equivalent payload.
+        """
+        return msgspec.convert(transcript_data, type=Transcript).to_payload()
+
+
+class TranscriptMetadata(msgspec.Struct):
+    """
+    Episode metadata in the JSON shape produced by the collector.
+    """
+    title: str
+    duration: float
+    words: int
+    episode_url: str
+    feed_url: str
+    podcast_name: Optional[str] = None
+    published_date: Optional[str] = None
+
+
+class Transcript(msgspec.Struct):
+    """
+    A transcript and its metadata, as exchanged in JSON.
+    """
+    transcript: str
+    metadata: TranscriptMetadata
+
+    def to_payload(self) -> TranscriptPayload:
+        """
+        Flatten into the payload used by the pipeline stages.
+
+        Returns:
+            TranscriptPayload: The equivalent payload.
+        """
+        metadata = self.metadata
+        return TranscriptPayload(
+            transcript=self.transcript,
+            title=metadata.title,
+            duration=metadata.duration,
+            words=metadata.words,
+            episode_url=metadata.episode_url,
+            feed_url=metadata.feed_url,
+            podcast_name=metadata.podcast_name,
+            published_date=metadata.published_date,
+        )
+
+
+def decode_transcript(raw: Union[bytes, str]) -> Transcript:
+    """
+    Decode and validate a transcript from JSON.
+
+    Args:
+        raw (Union[bytes, str]): JSON-encoded transcript and metadata
+
+    Returns:
+        Transcript: The decoded transcript.
+    """
+    return msgspec.json.decode(raw, type=Transcript)
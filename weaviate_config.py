@@ -1,249 +1,630 @@
+import atexit
+import logging
 import os
-from typing import Optional
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache, partial
+from typing import Iterable, List, Optional, Set, Union
 import weaviate
 from weaviate.auth import AuthApiKey
 from weaviate.connect import ConnectionParams
-from dotenv import load_dotenv
+from weaviate.classes.config import Configure, DataType, Property, ReferenceProperty
+from weaviate.classes.data import DataObject
+from weaviate.classes.init import AdditionalConfig, Timeout
+from transcript_models import Transcript, TranscriptPayload
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 # Schema definitions
-CLASS_OBJ_EMAILS = {
-    "class": "Email",
-    "vectorizer": "text2vec-openai",
-    "moduleConfig": {
-        "text2vec-openai": {
-            "model": "ada",
-            "modelVersion": "002",
-            "type": "text"
-        }
-    },
-    "properties": [
-        {
-            "name": "content",
-            "dataType": ["text"],
-            "description": "The email content",
-            "vectorizePropertyName": True,
-        },
-        {
-            "name": "subject",
-            "dataType": ["text"],
-            "description": "Email subject",
-        },
-        {
-            "name": "sender",
-            "dataType": ["TEXT"],
-        },
-        {
-            "name": "timestamp",
-            "dataType": ["date"],
-        }
-    ]
-}
-
-CLASS_OBJ_PODCASTS = {
-    "class": "PodcastTranscript",
-    "vectorizer": "text2vec-openai",
-    "moduleConfig": {
-        "text2vec-openai": {
-            "model": "ada",
-            "modelVersion": "002",
-            "type": "text"
-        }
-    },
-    "properties": [
-        {
-            "name": "transcript",
-            "dataType": ["text"],
-            "description": "The podcast transcript",
-            "vectorizePropertyName": True,
-        },
-        {
-            "name": "title",
-            "dataType": ["text"],
-            "description": "Episode title",
-        },
-        {
-            "name": "podcastName",
-            "dataType": ["TEXT"],
-            "description": "Name of the podcast show",
-        },
-        {
-            "name": "duration",
-            "dataType": ["number"],
-            "description": "Duration in seconds",
-        },
-        {
-            "name": "episodeUrl",
-            "dataType": ["TEXT"],
-        },
-        {
-            "name": "feedUrl",
-            "dataType": ["TEXT"],
-        },
-        {
-            "name": "wordCount",
-            "dataType": ["number"],
-        },
-        {
-            "name": "publishedDate",
-            "dataType": ["date"],
-        }
-    ]
-}
-
-def init_weaviate_client() -> weaviate.WeaviateClient:
+_EMAIL_PROPERTIES = (
+    Property(
+        name="content",
+        data_type=DataType.TEXT,
+        description="The email content",
+        vectorize_property_name=True,
+    ),
+    Property(
+        name="subject",
+        data_type=DataType.TEXT,
+        description="Email subject",
+    ),
+    Property(
+        name="sender",
+        data_type=DataType.TEXT,
+    ),
+    Property(
+        name="timestamp",
+        data_type=DataType.DATE,
+    ),
+)
+
+_PODCAST_PROPERTIES = (
+    Property(
+        name="transcript",
+        data_type=DataType.TEXT,
+        description="The podcast transcript",
+        vectorize_property_name=True,
+    ),
+    Property(
+        name="title",
+        data_type=DataType.TEXT,
+        description="Episode title",
+    ),
+    Property(
+        name="podcastName",
+        data_type=DataType.TEXT,
+        description="Name of the podcast show",
+    ),
+    Property(
+        name="duration",
+        data_type=DataType.NUMBER,
+        description="Duration in seconds",
+    ),
+    Property(
+        name="episodeUrl",
+        data_type=DataType.TEXT,
+    ),
+    Property(
+        name="feedUrl",
+        data_type=DataType.TEXT,
+    ),
+    Property(
+        name="wordCount",
+        data_type=DataType.NUMBER,
+    ),
+    Property(
+        name="publishedDate",
+        data_type=DataType.DATE,
+    ),
+)
+
+_PODCAST_CHUNK_PROPERTIES = (
+    Property(
+        name="text",
+        data_type=DataType.TEXT,
+        description="A window of the podcast transcript",
+    ),
+    Property(
+        name="chunkIndex",
+        data_type=DataType.INT,
+        description="Position of the window within the transcript",
+        skip_vectorization=True,
+    ),
+)
+
+_PODCAST_CHUNK_REFERENCES = (
+    ReferenceProperty(
+        name="transcript",
+        target_collection="PodcastTranscript",
+    ),
+)
+
+# Shared client, created on first use and reused for the life of the process
+_CLIENT: Optional[weaviate.WeaviateClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+# The .env file is only read when a client is first constructed
+_DOTENV_LOADED = False
+
+# Fail fast on connect, but give large transcript inserts room to finish
+_ADDITIONAL_CONFIG = AdditionalConfig(
+    timeout=Timeout(init=5, query=30, insert=120)
+)
+
+
+def _load_dotenv_once() -> None:
+    """
+    Load environment variables from .env the first time a client is built.
+    """
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+def init_weaviate_client(check_ready: bool = True) -> weaviate.WeaviateClient:
     """
     Initialize the Weaviate client with configuration.
+
+    The client is created and connected once per process; later calls
+    return the same instance so its HTTP and gRPC connections are reused.
+    The readiness probe only ever runs when the client is first created.
+    Args:
+        check_ready (bool): Probe is_ready() after connecting; connect()
+            already fails on an unreachable instance, so callers on a hot
+            path can skip the extra round trip
     Returns:
         weaviate.WeaviateClient: Configured Weaviate client instance
     """
-    # Get configuration from environment variables
-    WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
-
-    client = weaviate.WeaviateClient(
-        connection_params=ConnectionParams.from_params(
-            http_host="localhost",     # Localhost for HTTP
-            http_port=8080,           # Default HTTP port
-            http_secure=False,        # False since you're using HTTP (not HTTPS)
-            grpc_host="localhost",    # Localhost for gRPC
-            grpc_port=50051,          # Default gRPC port
-            grpc_secure=False         # False since you're not using secure gRPC
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            return _CLIENT
+
+        # Load environment variables
+        _load_dotenv_once()
+
+        # Get configuration from environment variables
+        WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
+
+        client = weaviate.WeaviateClient(
+            connection_params=ConnectionParams.from_params(
+                http_host="localhost",     # Localhost for HTTP
+                http_port=8080,           # Default HTTP port
+                http_secure=False,        # False since you're using HTTP (not HTTPS)
+                grpc_host="localhost",    # Localhost for gRPC
+                grpc_port=50051,          # Default gRPC port
+                grpc_secure=False         # False since you're not using secure gRPC
+            ),
+            additional_config=_ADDITIONAL_CONFIG
         )
-    )
+        
+        # Explicitly connect the client
+        client.connect()
+        if check_ready and not client.is_ready():
+            client.close()
+            raise RuntimeError("Failed to connect to the Weaviate instance.")
+
+        # Drain the gRPC channel cleanly on interpreter exit
+        atexit.register(client.close)
+        _CLIENT = client
     
-    # Explicitly connect the client
-    client.connect()
-    if not client.is_ready():
+    return _CLIENT
+
+
+def get_weaviate_client() -> weaviate.WeaviateClient:
+    """
+    Get the shared Weaviate client, initializing it on first use.
+
+    Skips the readiness probe, for hot paths that just need the client.
+    Returns:
+        weaviate.WeaviateClient: Shared Weaviate client instance
+    """
+    return init_weaviate_client(check_ready=False)
+
+
+async def init_weaviate_client_async() -> weaviate.WeaviateAsyncClient:
+    """
+    Initialize and connect an async Weaviate client.
+
+    The async client is bound to the running event loop, so it is not
+    shared like the sync client; callers should close it when done.
+    Returns:
+        weaviate.WeaviateAsyncClient: Connected async Weaviate client instance
+    """
+    _load_dotenv_once()
+
+    client = weaviate.use_async_with_custom(
+        http_host="localhost",
+        http_port=8080,
+        http_secure=False,
+        grpc_host="localhost",
+        grpc_port=50051,
+        grpc_secure=False,
+        additional_config=_ADDITIONAL_CONFIG
+    )
+
+    await client.connect()
+    if not await client.is_ready():
+        await client.close()
         raise RuntimeError("Failed to connect to the Weaviate instance.")
-    
+
     return client
 
 
-def ensure_schema_exists(client: weaviate.WeaviateClient) -> None:
+# Set once the schema has been verified, so later calls skip the round trips
+_SCHEMA_READY = False
+_CHUNK_SCHEMA_READY = False
+
+
+def _existing_collections(client: weaviate.WeaviateClient, names: Iterable[str]) -> Set[str]:
     """
-    Ensure that the required collections exist in Weaviate.
+    Find which of the given collections already exist.
+
+    Checks each name individually rather than fetching the full schema,
+    falling back to list_all() if the per-collection check fails.
     Args:
         client (weaviate.WeaviateClient): Initialized Weaviate client
+        names (Iterable[str]): Collection names to check
+    Returns:
+        Set[str]: The names that exist
     """
     try:
-        # List all existing collections
+        return {name for name in names if client.collections.exists(name)}
+    except Exception:
         existing_collections = client.collections.list_all()
+        return {name for name in names if name in existing_collections}
 
-        # Check and create Email collection if it doesn't exist
-        if "Email" not in existing_collections:
-            client.collections.create(
-                name="Email",
-                vectorizer_config=weaviate.classes.config.Configure.Vectorizer.text2vec_openai(),
-                properties=[
-                    weaviate.classes.config.Property(
-                        name="content",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="The email content",
-                        vectorize_property_name=True,
-                    ),
-                    weaviate.classes.config.Property(
-                        name="subject",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Email subject",
-                    ),
-                    weaviate.classes.config.Property(
-                        name="sender",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                    ),
-                    weaviate.classes.config.Property(
-                        name="timestamp",
-                        data_type=weaviate.classes.config.DataType.DATE,
-                    ),
-                ]
-            )
 
-        # Check and create PodcastTranscript collection if it doesn't exist
-        if "PodcastTranscript" not in existing_collections:
-            client.collections.create(
-                name="PodcastTranscript",
-                vectorizer_config=weaviate.classes.config.Configure.Vectorizer.text2vec_openai(),
-                properties=[
-                    weaviate.classes.config.Property(
-                        name="transcript",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="The podcast transcript",
-                        vectorize_property_name=True,
-                    ),
-                    weaviate.classes.config.Property(
-                        name="title",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Episode title",
-                    ),
-                    weaviate.classes.config.Property(
-                        name="podcastName",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                        description="Name of the podcast show",
-                    ),
-                    weaviate.classes.config.Property(
-                        name="duration",
-                        data_type=weaviate.classes.config.DataType.NUMBER,
-                        description="Duration in seconds",
-                    ),
-                    weaviate.classes.config.Property(
-                        name="episodeUrl",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                    ),
-                    weaviate.classes.config.Property(
-                        name="feedUrl",
-                        data_type=weaviate.classes.config.DataType.TEXT,
-                    ),
-                    weaviate.classes.config.Property(
-                        name="wordCount",
-                        data_type=weaviate.classes.config.DataType.NUMBER,
-                    ),
-                    weaviate.classes.config.Property(
-                        name="publishedDate",
-                        data_type=weaviate.classes.config.DataType.DATE,
-                    ),
-                ]
+def _create_email(client: weaviate.WeaviateClient) -> None:
+    """
+    Create the Email collection.
+    Args:
+        client (weaviate.WeaviateClient): Initialized Weaviate client
+    """
+    client.collections.create(
+        name="Email",
+        vectorizer_config=Configure.Vectorizer.text2vec_openai(),
+        properties=list(_EMAIL_PROPERTIES)
+    )
+
+
+def _create_podcast(
+    client: weaviate.WeaviateClient,
+    skip_vectorizer: bool = False,
+    ef_construction: Optional[int] = None
+) -> None:
+    """
+    Create the PodcastTranscript collection.
+    Args:
+        client (weaviate.WeaviateClient): Initialized Weaviate client
+        skip_vectorizer (bool): Create the collection without a vectorizer,
+            for objects stored with precomputed vectors
+        ef_construction (Optional[int]): HNSW efConstruction; lower values
+            build the index faster at some cost in recall. Server default
+            when unset
+    """
+    if skip_vectorizer:
+        vectorizer_config = Configure.Vectorizer.none()
+    else:
+        vectorizer_config = Configure.Vectorizer.text2vec_openai()
+
+    client.collections.create(
+        name="PodcastTranscript",
+        vectorizer_config=vectorizer_config,
+        vector_index_config=Configure.VectorIndex.hnsw(ef_construction=ef_construction)
+            if ef_construction is not None else None,
+        properties=list(_PODCAST_PROPERTIES)
+    )
+
+
+def _create_podcast_chunks(client: weaviate.WeaviateClient, skip_vectorizer: bool = False) -> None:
+    """
+    Create the PodcastTranscriptChunk collection.
+    Args:
+        client (weaviate.WeaviateClient): Initialized Weaviate client
+        skip_vectorizer (bool): Create the collection without a vectorizer,
+            matching a PodcastTranscript collection fed precomputed vectors
+    """
+    if skip_vectorizer:
+        vectorizer_config = Configure.Vectorizer.none()
+    else:
+        vectorizer_config = Configure.Vectorizer.text2vec_openai()
+
+    client.collections.create(
+        name="PodcastTranscriptChunk",
+        vectorizer_config=vectorizer_config,
+        properties=list(_PODCAST_CHUNK_PROPERTIES),
+        references=list(_PODCAST_CHUNK_REFERENCES)
+    )
+
+
+def ensure_schema_exists(
+    client: weaviate.WeaviateClient,
+    skip_vectorizer: bool = False,
+    ef_construction: Optional[int] = None,
+    chunks: bool = False
+) -> None:
+    """
+    Ensure that the required collections exist in Weaviate.
+
+    The check runs once per process. Set HODGEPOD_SKIP_SCHEMA_CHECK=1 to
+    skip it entirely when the schema is known to be in place. Missing
+    collections are created concurrently; when ``chunks`` is set,
+    PodcastTranscriptChunk follows once PodcastTranscript, which it
+    references, is in place.
+    Args:
+        client (weaviate.WeaviateClient): Initialized Weaviate client
+        skip_vectorizer (bool): Create PodcastTranscript (and the chunk
+            collection) without a vectorizer, for use with
+            store_podcast_transcripts_bulk(..., vectors=...)
+        ef_construction (Optional[int]): HNSW efConstruction for a newly
+            created PodcastTranscript, e.g. 16 for a fast cold bulk load.
+            Weaviate fixes this at creation, so it has no effect on an
+            existing collection
+        chunks (bool): Also ensure PodcastTranscriptChunk, for use with
+            store_podcast_transcripts_bulk(..., chunk_tokens=...)
+    """
+    global _SCHEMA_READY, _CHUNK_SCHEMA_READY
+    if os.getenv("HODGEPOD_SKIP_SCHEMA_CHECK") == "1":
+        return
+    if _SCHEMA_READY and (_CHUNK_SCHEMA_READY or not chunks):
+        return
+
+    try:
+        names = ("Email", "PodcastTranscript")
+        if chunks:
+            names += ("PodcastTranscriptChunk",)
+        existing_collections = _existing_collections(client, names)
+
+        # Create whichever collections are missing
+        creators = [
+            create for name, create in (
+                ("Email", _create_email),
+                ("PodcastTranscript", partial(
+                    _create_podcast, skip_vectorizer=skip_vectorizer, ef_construction=ef_construction
+                )),
             )
+            if name not in existing_collections
+        ]
+        if creators:
+            with ThreadPoolExecutor(max_workers=len(creators)) as executor:
+                futures = [executor.submit(create, client) for create in creators]
+                wait(futures)
+            for future in futures:
+                future.result()
 
-    except Exception as e:
-        print(f"Error ensuring collection existence: {e}")
+        if chunks:
+            if "PodcastTranscriptChunk" not in existing_collections:
+                _create_podcast_chunks(client, skip_vectorizer=skip_vectorizer)
+            _CHUNK_SCHEMA_READY = True
+
+        _SCHEMA_READY = True
+
+    except Exception:
+        logger.exception("Error ensuring collection existence")
         raise
 
 
+def _as_payload(transcript_data: Union[TranscriptPayload, Transcript, dict]) -> TranscriptPayload:
+    """
+    Accept a TranscriptPayload, a decoded Transcript or the legacy transcript dict.
+    Args:
+        transcript_data (Union[TranscriptPayload, Transcript, dict]): Transcript and metadata
+    Returns:
+        TranscriptPayload: The transcript as a payload
+    """
+    if isinstance(transcript_data, TranscriptPayload):
+        return transcript_data
+    if isinstance(transcript_data, Transcript):
+        return transcript_data.to_payload()
+    return TranscriptPayload.from_dict(transcript_data)
+
+
+# Namespace for deterministic PodcastTranscript UUIDs derived from episode URLs
+_PODCAST_NAMESPACE = uuid.UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8")
+
+
+def _podcast_uuid(payload: TranscriptPayload) -> uuid.UUID:
+    """
+    Derive a stable UUID for a transcript from its episode URL.
+
+    Re-submitting the same episode then targets the same object instead of
+    creating (and vectorizing) a duplicate.
+    Args:
+        payload (TranscriptPayload): Transcript and metadata
+    Returns:
+        uuid.UUID: UUID5 of the episode URL
+    """
+    return uuid.uuid5(_PODCAST_NAMESPACE, payload.episode_url)
+
+
+def _podcast_properties(payload: TranscriptPayload) -> dict:
+    """
+    Map a collected transcript onto PodcastTranscript properties.
+    Args:
+        payload (TranscriptPayload): Transcript and metadata
+    Returns:
+        dict: Properties for a PodcastTranscript object
+    """
+    # Only derive a name from the feed URL when none was given
+    podcast_name = payload.podcast_name
+    if podcast_name is None:
+        podcast_name = payload.feed_url.rpartition("/")[2]
+
+    return {
+        "transcript": payload.transcript,
+        "title": payload.title,
+        "duration": payload.duration,
+        "wordCount": payload.words,
+        "episodeUrl": payload.episode_url,
+        "feedUrl": payload.feed_url,
+        "podcastName": podcast_name,
+        "publishedDate": payload.published_date
+    }
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    Load the tiktoken encoding used to size transcript chunks, if available.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _split_transcript(text: str, chunk_tokens: int) -> List[str]:
+    """
+    Split a transcript into windows of at most ``chunk_tokens`` tokens.
+
+    Uses tiktoken when it is installed and falls back to whitespace-separated
+    words otherwise.
+    Args:
+        text (str): The transcript text
+        chunk_tokens (int): Maximum tokens per window
+    Returns:
+        List[str]: The transcript windows, in order
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        words = text.split()
+        return [" ".join(words[i:i + chunk_tokens]) for i in range(0, len(words), chunk_tokens)]
+
+    tokens = encoding.encode(text)
+    return [encoding.decode(tokens[i:i + chunk_tokens]) for i in range(0, len(tokens), chunk_tokens)]
+
 
-def store_podcast_transcript(client: weaviate.WeaviateClient, transcript_data: dict) -> Optional[str]:
+def store_podcast_transcript(
+    client: weaviate.WeaviateClient,
+    transcript_data: Union[TranscriptPayload, Transcript, dict]
+) -> Optional[str]:
     """
     Store a podcast transcript in Weaviate.
     Args:
         client (weaviate.WeaviateClient): Initialized Weaviate client
-        transcript_data (dict): Dictionary containing transcript and metadata
+        transcript_data (Union[TranscriptPayload, Transcript, dict]): Transcript and metadata
     Returns:
         Optional[str]: UUID of the created object if successful, None otherwise
     """
     try:
         # Prepare the data object
-        data_object = {
-            "transcript": transcript_data["transcript"],
-            "title": transcript_data["metadata"]["title"],
-            "duration": transcript_data["metadata"]["duration"],
-            "wordCount": transcript_data["metadata"]["words"],
-            "episodeUrl": transcript_data["metadata"]["episode_url"],
-            "feedUrl": transcript_data["metadata"]["feed_url"],
-            "podcastName": transcript_data["metadata"].get(
-                "podcast_name",
-                transcript_data["metadata"]["feed_url"].split("/")[-1]
-            ),
-            "publishedDate": transcript_data["metadata"].get("published_date")
-        }
-        
-        # Store in Weaviate
-        result = client.data_object.create(
-            class_name="PodcastTranscript",
-            data_object=data_object
-        )
+        payload = _as_payload(transcript_data)
+        data_object = _podcast_properties(payload)
+        obj_uuid = _podcast_uuid(payload)
         
-        return result["id"]
+        # Store in Weaviate over the client's gRPC channel
+        collection = client.collections.get("PodcastTranscript")
+        try:
+            return str(collection.data.insert(properties=data_object, uuid=obj_uuid))
+        except Exception:
+            # A retried episode is rejected as a duplicate; it is already stored
+            if collection.data.exists(obj_uuid):
+                return str(obj_uuid)
+            raise
     
-    except Exception as e:
-        print(f"Error storing transcript in Weaviate: {str(e)}")
-        return None
\ No newline at end of file
+    except Exception:
+        logger.exception("Error storing transcript in Weaviate")
+        return None
+
+
+def store_podcast_transcripts_bulk(
+    client: weaviate.WeaviateClient,
+    transcripts: List[Union[TranscriptPayload, Transcript, dict]],
+    vectors: Optional[List[List[float]]] = None,
+    concurrent_requests: Optional[int] = None,
+    chunk_tokens: Optional[int] = None
+) -> List[Optional[str]]:
+    """
+    Store multiple podcast transcripts in Weaviate using the batch API.
+
+    Objects are sent in fixed-size batches of 100, with several requests in
+    flight, instead of one round trip per transcript. More concurrent
+    requests help over high-latency links, but too many can saturate the
+    server, so keep the value modest.
+
+    When ``vectors`` are supplied they are stored as-is and the server does
+    not call the vectorizer; create the collection with
+    ``ensure_schema_exists(client, skip_vectorizer=True)`` in that case.
+
+    When ``chunk_tokens`` is set, each transcript is instead split into
+    windows of that many tokens and stored as PodcastTranscriptChunk objects
+    that reference their parent. The parent then keeps only the episode
+    metadata, so the server vectorizes small chunks in parallel rather than
+    one multi-MB string; the full text is the chunks in chunkIndex order.
+    Create that collection with ``ensure_schema_exists(client, chunks=True)``
+    first. Chunks are vectorized by the server, so ``vectors`` cannot be
+    combined with ``chunk_tokens``.
+    Args:
+        client (weaviate.WeaviateClient): Initialized Weaviate client
+        transcripts (List[Union[TranscriptPayload, Transcript, dict]]): Transcripts and metadata
+        vectors (Optional[List[List[float]]]): Precomputed embedding for each
+            transcript, in the same order
+        concurrent_requests (Optional[int]): Batch requests to keep in flight;
+            defaults to min(4, os.cpu_count())
+        chunk_tokens (Optional[int]): Tokens per chunk, e.g. 500; no chunks are
+            stored when unset
+    Returns:
+        List[Optional[str]]: UUID for each transcript, in input order, or None
+            where it could not be stored
+    Raises:
+        ValueError: If ``vectors`` does not match ``transcripts`` in length, or
+            is given together with ``chunk_tokens``
+    """
+    if vectors is not None and len(vectors) != len(transcripts):
+        raise ValueError(f"Got {len(vectors)} vectors for {len(transcripts)} transcripts")
+    if vectors is not None and chunk_tokens:
+        raise ValueError("vectors cannot be combined with chunk_tokens; the chunks would have no vectors")
+
+    if concurrent_requests is None:
+        concurrent_requests = min(4, os.cpu_count() or 1)
+
+    try:
+        uuids = []
+        chunk_uuids = []
+        with client.batch.fixed_size(batch_size=100, concurrent_requests=concurrent_requests) as batch:
+            for i, transcript_data in enumerate(transcripts):
+                payload = _as_payload(transcript_data)
+                parent_uuid = _podcast_uuid(payload)
+                properties = _podcast_properties(payload)
+                if chunk_tokens:
+                    # The chunks carry the text; vectorizing it whole on the
+                    # parent is the oversized request chunking avoids
+                    del properties["transcript"]
+                uuids.append(batch.add_object(
+                    collection="PodcastTranscript",
+                    properties=properties,
+                    uuid=parent_uuid,
+                    vector=vectors[i] if vectors is not None else None
+                ))
+
+                chunks = []
+                if chunk_tokens:
+                    for index, text in enumerate(_split_transcript(payload.transcript, chunk_tokens)):
+                        chunks.append(batch.add_object(
+                            collection="PodcastTranscriptChunk",
+                            properties={"text": text, "chunkIndex": index},
+                            references={"transcript": parent_uuid},
+                            uuid=uuid.uuid5(_PODCAST_NAMESPACE, f"{payload.episode_url}#{index}")
+                        ))
+                chunk_uuids.append(chunks)
+
+        failed = {str(obj.object_.uuid) for obj in client.batch.failed_objects}
+        for obj in client.batch.failed_objects:
+            logger.warning("Error storing transcript in Weaviate: %s", obj.message)
+
+        # A transcript only counts as stored once all of its chunks are too
+        return [
+            str(obj_uuid)
+            if str(obj_uuid) not in failed and not any(str(chunk) in failed for chunk in chunks)
+            else None
+            for obj_uuid, chunks in zip(uuids, chunk_uuids)
+        ]
+
+    except Exception:
+        logger.exception("Error storing transcripts in Weaviate")
+        return [None] * len(transcripts)
+
+
+async def store_podcast_transcripts_async(
+    client: weaviate.WeaviateAsyncClient,
+    transcripts: List[Union[TranscriptPayload, Transcript, dict]]
+) -> List[Optional[str]]:
+    """
+    Store multiple podcast transcripts in Weaviate using the async client.
+
+    The async client does not provide the batch context, so the objects are
+    sent with a single insert_many call over gRPC.
+    Args:
+        client (weaviate.WeaviateAsyncClient): Connected async Weaviate client
+        transcripts (List[Union[TranscriptPayload, Transcript, dict]]): Transcripts and metadata
+    Returns:
+        List[Optional[str]]: UUID for each transcript, in input order, or None
+            where it could not be stored
+    """
+    try:
+        collection = client.collections.get("PodcastTranscript")
+        payloads = [_as_payload(transcript_data) for transcript_data in transcripts]
+        result = await collection.data.insert_many([
+            DataObject(properties=_podcast_properties(payload), uuid=_podcast_uuid(payload))
+            for payload in payloads
+        ])
+
+        for error in result.errors.values():
+            logger.warning("Error storing transcript in Weaviate: %s", error.message)
+
+        return [
+            str(result.uuids[index]) if index in result.uuids else None
+            for index in range(len(transcripts))
+        ]
+
+    except Exception:
+        logger.exception("Error storing transcripts in Weaviate")
+        return [None] * len(transcripts)